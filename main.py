@@ -1,8 +1,54 @@
-import random
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # Numba is optional, the pure Python paths are used instead
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that leaves the function uncompiled."""
+        def decorator(func):
+            return func
+        return decorator
+
+try:
+    from placement_core import place_all  # Cython build of _place_member, see setup.py
+    PLACEMENT_CORE_AVAILABLE = True
+except ImportError:
+    PLACEMENT_CORE_AVAILABLE = False
+
+OCCUPANCY_CELL = 10  # Edge length of one occupancy grid cell, in ULD units
+ORDER_SPREAD = 2.0  # Volume octaves over which package orders are perturbed
+
+# Packed boxes hold coordinates in 16-bit fields whose top bit must stay clear
+MAX_COORDINATE = (1 << 15) - 1
+SWAR_GUARD = np.uint64(0x0000_8000_8000_8000)  # Top bit of each field
+SWAR_ONES = np.uint64(0x0000_0001_0001_0001)  # One in each field
+SWAR_SHIFTS = np.array([0, 16, 32], dtype=np.uint64)  # Field offsets of x, y, z
+
+
+def whole_dimensions(name, *dims):
+    """Returns the dimensions as ints, so integral floats such as 50.0 are accepted.
+
+    The occupancy grid and the packed corners both index by whole units, so
+    fractional dimensions raise ValueError.
+    """
+    if not all(float(d).is_integer() for d in dims):
+        raise ValueError(f"{name} has fractional dimensions {dims}, whole units are required")
+    return tuple(int(d) for d in dims)
+
 
 class Package:
     """Represents a package to be loaded into a ULD."""
+    __slots__ = ('id', 'length', 'width', 'height', 'weight', 'priority',
+                 'cost_delay', 'position', 'placed', 'uld_id')
+
     def __init__(self, pkg_id, length, width, height, weight, priority, cost_delay):
+        length, width, height = whole_dimensions(f"Package {pkg_id}", length, width, height)
         self.id = pkg_id
         self.length = length
         self.width = width
@@ -10,73 +56,197 @@ class Package:
         self.weight = weight
         self.priority = priority
         self.cost_delay = cost_delay
+        self.reset()
+
+    def reset(self):
+        """Marks the package as not placed."""
         self.position = None  # Coordinates (x0, y0, z0, x1, y1, z1)
         self.placed = False  # Tracks if the package is placed
         self.uld_id = "NONE"  # Default ULD ID if not placed
 
 
+@njit(cache=True)
+def pack_corner(x, y, z):
+    """Packs a box corner into one uint64, 16 bits per coordinate (SWAR)."""
+    return np.uint64(x) | (np.uint64(y) << np.uint64(16)) | (np.uint64(z) << np.uint64(32))
+
+
+def pack_corners(points):
+    """Vectorised pack_corner over the rows of a (K, 3) array."""
+    return np.bitwise_or.reduce(np.asarray(points, dtype=np.uint64) << SWAR_SHIFTS, axis=1)
+
+
+@njit(cache=True, fastmath=True)
+def _overlap_any(lo, hi, boxes_lo, boxes_hi):
+    """Checks if the packed candidate box overlaps any of the packed boxes.
+
+    Boxes overlap when lo < other hi and other lo < hi on every axis. With
+    SWAR_GUARD set above each field, (b | SWAR_GUARD) - a - SWAR_ONES keeps
+    the guard bit of a field iff a < b in that field, and fields never borrow
+    from each other, so each test is two subtractions and a mask.
+    """
+    hits = 0
+    for i in range(boxes_lo.shape[0]):
+        before = (boxes_hi[i] | SWAR_GUARD) - lo - SWAR_ONES
+        after = (hi | SWAR_GUARD) - boxes_lo[i] - SWAR_ONES
+        hits += (before & after & SWAR_GUARD) == SWAR_GUARD
+    return hits > 0
+
+
 class ULD:
     """Represents a Unit Load Device (ULD) for packing packages."""
+    __slots__ = ('id', 'length', 'width', 'height', 'weight_limit', 'occ',
+                 'eligible_mask', 'packages', 'total_weight', 'priority_count',
+                 'stack', 'extreme_points', '_box_lo', '_box_hi')
     
     def __init__(self, uld_id, length, width, height, weight_limit):
+        length, width, height = whole_dimensions(f"ULD {uld_id}", length, width, height)
+        if max(length, width, height) > MAX_COORDINATE:
+            raise ValueError(f"ULD {uld_id} is larger than {MAX_COORDINATE} along some axis")
         self.id = uld_id
         self.length = length
         self.width = width
         self.height = height
         self.weight_limit = weight_limit
+        self.occ = np.zeros((-(-length // OCCUPANCY_CELL),
+                             -(-width // OCCUPANCY_CELL),
+                             -(-height // OCCUPANCY_CELL)), dtype=np.uint8)
+        self.eligible_mask = None  # Packages small enough for this ULD, set by create_initial_population
+        self.reset()
+
+    def reset(self):
+        """Empties the ULD so it can be filled again from scratch."""
         self.packages = []
         self.total_weight = 0
+        self.priority_count = 0  # Number of priority packages placed here
+        self.stack = []  # (z0, weight) of each package placed here, see fitness_function
+        self.extreme_points = {(0, 0, 0)}  # Candidate corners for the next package
+        # Packed corners of the placed packages, see pack_corner
+        self._box_lo = np.empty(0, dtype=np.uint64)
+        self._box_hi = np.empty(0, dtype=np.uint64)
+        self.occ.fill(0)
 
-    def can_fit(self, package):
-        """Checks if a package can be placed in the ULD."""
-        return (self.total_weight + package.weight <= self.weight_limit and 
-                package.length <= self.length and 
-                package.width <= self.width and 
-                package.height <= self.height)
+    def can_fit_weight(self, package):
+        """Checks if the package fits in the ULD's remaining weight capacity."""
+        return self.total_weight + package.weight <= self.weight_limit
 
     def add_package(self, package):
         """Adds a package to the ULD if it fits at a valid position."""
+        # find_next_position checks the weight and keeps the box inside the ULD
         position = self.find_next_position(package)
         
-        if position and self.can_fit(package):
-            x0, y0, z0 = position
-            package.position = (x0, y0, z0,
-                                x0 + package.length,
-                                y0 + package.width,
-                                z0 + package.height)
-            self.packages.append(package)
-            self.total_weight += package.weight
-            package.placed = True
-            package.uld_id = self.id
+        if position:
+            self.place_package(package, position)
             return True
         return False
 
+    def place_package(self, package, position):
+        """Places the package with its corner at position, without any checks."""
+        x0, y0, z0 = position
+        package.position = (x0, y0, z0,
+                            x0 + package.length,
+                            y0 + package.width,
+                            z0 + package.height)
+        self.packages.append(package)
+        self.total_weight += package.weight
+        self.priority_count += package.priority
+        self.stack.append((z0, package.weight))
+        package.placed = True
+        package.uld_id = self.id
+        corners = pack_corners((package.position[:3], package.position[3:]))
+        self._box_lo = np.append(self._box_lo, corners[0])
+        self._box_hi = np.append(self._box_hi, corners[1])
+        self.mark_occupied(package.position)
+        self.update_extreme_points(package)
+
+    def update_extreme_points(self, package):
+        """Replaces the used corner with the three corners exposed by the package."""
+        x0, y0, z0, x1, y1, z1 = package.position
+        self.extreme_points.discard((x0, y0, z0))
+        for point in ((x1, y0, z0), (x0, y1, z0), (x0, y0, z1)):
+            if point[0] < self.length and point[1] < self.width and point[2] < self.height:
+                self.extreme_points.add(point)
+
+    def mark_occupied(self, position):
+        """Marks every occupancy cell touched by the box as used."""
+        c = OCCUPANCY_CELL
+        x0, y0, z0, x1, y1, z1 = position
+        self.occ[x0 // c:-(-x1 // c), y0 // c:-(-y1 // c), z0 // c:-(-z1 // c)] = 1
+
     def find_next_position(self, package):
-        """Finds the next available position in the ULD for the package."""
-        if not self.packages:
-            return (0, 0, 0)  # First package starts at (0, 0, 0)
+        """Finds the next available position in the ULD for the package.
 
-        for x in range(self.length):
-            for y in range(self.width):
-                for z in range(self.height):
-                    if self.is_position_valid(package, x, y, z):
-                        return (x, y, z)
+        The extreme points (corners exposed by already placed packages) are
+        tried first, in bottom-left-back order (z, then y, then x). If none of
+        them fits, the occupancy grid is searched exhaustively.
+        """
+        if not self.can_fit_weight(package):
+            return None  # No position can help once the weight limit is hit
 
-        return None  # No valid position found
+        points = sorted(self.extreme_points, key=lambda p: (p[2], p[1], p[0]))
+        position = self.first_valid_position(package, points)
+        if position is not None:
+            return position
+
+        return self.find_free_cell(package)
+
+    def first_valid_position(self, package, points):
+        """Returns the first of the candidate corners where the package fits, if any.
+
+        All K candidates are tested against all N placed packages in one
+        broadcast over the packed corners (see _overlap_any), giving a (K, N)
+        overlap matrix instead of a Python loop per candidate.
+        """
+        starts = np.asarray(points, dtype=np.int64).reshape(-1, 3)
+        ends = starts + (package.length, package.width, package.height)
+        inside = np.all(ends <= (self.length, self.width, self.height), axis=1)
+
+        lo = pack_corners(starts)[:, None]
+        hi = pack_corners(np.minimum(ends, MAX_COORDINATE))[:, None]
+        before = (self._box_hi | SWAR_GUARD) - lo - SWAR_ONES
+        after = (hi | SWAR_GUARD) - self._box_lo - SWAR_ONES
+        overlaps = (before & after & SWAR_GUARD) == SWAR_GUARD
+
+        valid = np.flatnonzero(inside & ~overlaps.any(axis=1))
+        if valid.size == 0:
+            return None
+        return tuple(starts[valid[0]].tolist())
+
+    def find_free_cell(self, package):
+        """Finds the first grid-aligned position whose cells are all free.
+
+        Every placement is tested at once: a summed-volume table of the
+        occupancy grid gives the number of used cells under each window with
+        eight lookups. Cells are marked conservatively, so a free window never
+        overlaps a placed package.
+        """
+        c = OCCUPANCY_CELL
+        wl, ww, wh = -(-package.length // c), -(-package.width // c), -(-package.height // c)
+        # Number of grid origins that keep the package inside the ULD
+        nx = (self.length - package.length) // c + 1
+        ny = (self.width - package.width) // c + 1
+        nz = (self.height - package.height) // c + 1
+        if min(nx, ny, nz) <= 0:
+            return None
+
+        table = np.zeros(tuple(n + 1 for n in self.occ.shape), dtype=np.int32)
+        table[1:, 1:, 1:] = self.occ.cumsum(0).cumsum(1).cumsum(2)
+        x0, x1 = slice(0, nx), slice(wl, wl + nx)
+        y0, y1 = slice(0, ny), slice(ww, ww + ny)
+        z0, z1 = slice(0, nz), slice(wh, wh + nz)
+        used = (table[x1, y1, z1] - table[x0, y1, z1] - table[x1, y0, z1] - table[x1, y1, z0]
+                + table[x0, y0, z1] + table[x0, y1, z0] + table[x1, y0, z0] - table[x0, y0, z0])
+        # Same bottom-left-back order as the extreme points: z, then y, then x
+        hits = np.flatnonzero(used.transpose(2, 1, 0) == 0)
+        if hits.size == 0:
+            return None  # No valid position found
+
+        gz, gy, gx = np.unravel_index(hits[0], (nz, ny, nx))
+        return (int(gx) * c, int(gy) * c, int(gz) * c)
 
     def is_position_valid(self, package, x, y, z):
         """Checks if a package can be placed at (x, y, z) without overlapping."""
-        if (x + package.length <= self.length and
-            y + package.width <= self.width and
-            z + package.height <= self.height):
-            for p in self.packages:
-                if self.do_packages_overlap(p.position, (x, y, z, 
-                                                         x + package.length, 
-                                                         y + package.width, 
-                                                         z + package.height)):
-                    return False
-            return True
-        return False
+        return self.first_valid_position(package, [(x, y, z)]) is not None
 
     def do_packages_overlap(self, pos1, pos2):
         """Checks if two cuboidal packages overlap in 3D space."""
@@ -88,26 +258,65 @@ class ULD:
                     z1_1 <= z0_2 or z0_1 >= z1_2)    # No overlap along z-axis
 
 
-def fitness_function(ulds_list, packages_list):
-    """Calculates the fitness score of a solution."""
+def placement_masks(packages_list):
+    """Returns boolean arrays marking the placed and the priority packages.
+
+    This reads every package, so it is only the fallback for callers that do
+    not track the masks: apply_plan returns the placed_mask, and the priority
+    mask can be built once up front.
+    """
+    n = len(packages_list)
+    placed_mask = np.fromiter((pkg.placed for pkg in packages_list), dtype=bool, count=n)
+    priority_mask = np.fromiter((pkg.priority for pkg in packages_list), dtype=bool, count=n)
+    return placed_mask, priority_mask
+
+
+def fitness_function(ulds_list, packages_list, placed_mask=None, priority_mask=None):
+    """Calculates the fitness score of a solution.
+
+    placed_mask and priority_mask can be passed by callers that already track
+    them, see placement_masks.
+    """
+    if placed_mask is None or priority_mask is None:
+        placed_mask, priority_mask = placement_masks(packages_list)
+    uld_states = tuple((uld.weight_limit, uld.total_weight, uld.priority_count > 0,
+                        tuple(uld.stack))
+                       for uld in ulds_list)
+    unplaced_economy_packages = int(np.count_nonzero(~placed_mask & ~priority_mask))
+    return score_solution(uld_states, unplaced_economy_packages)
+
+
+@lru_cache(maxsize=4096)
+def score_solution(uld_states, unplaced_economy_packages):
+    """Scores a solution from its hashable summary, see fitness_function.
+
+    Each ULD state is (weight_limit, total_weight, has_priority, stack), where
+    stack is the tuple of the (z0, weight) of its packages, as kept by
+    ULD.place_package.
+
+    Stacks are in placement order, not sorted, as sorting cost as much as a
+    cache miss. A plan replayed by apply_plan gives back the key it was scored
+    with: the pure Python path keys in placement order, the compiled paths in
+    package index order, and each plan lists its packages in that same order.
+    The same packages placed in another order miss the cache, but score the
+    same, since count_unstable sorts by z0 itself.
+    """
     fitness_score = 0
     weight_penalty = 0
     stability_penalty = 0
     unplaced_packages_penalty = 0
     priority_spread_penalty = 0
 
-    num_priority_uld = sum(1 for uld in ulds_list if any(pkg.priority for pkg in uld.packages))
-    unplaced_economy_packages = sum(1 for pkg in packages_list if not pkg.placed and not pkg.priority)
+    num_priority_uld = sum(1 for state in uld_states if state[2])
 
-    for uld in ulds_list:
+    for weight_limit, total_weight, _, stack in uld_states:
         # Penalize weight violations
-        if uld.total_weight > uld.weight_limit:
-            weight_penalty += (uld.total_weight - uld.weight_limit) * 10
+        if total_weight > weight_limit:
+            weight_penalty += (total_weight - weight_limit) * 10
             
-        # Check stability for each package in uld.packages:
-        for package in uld.packages:
-            if not is_stable(package, uld):
-                stability_penalty += 1
+        # Check stability for each package in the stack
+        stack_np = np.array(stack, dtype=float).reshape(-1, 2)
+        stability_penalty += count_unstable(stack_np[:, 0], stack_np[:, 1])
 
     # Penalty for unplaced Economy Packages
     unplaced_packages_penalty = 50 * unplaced_economy_packages
@@ -125,49 +334,315 @@ def fitness_function(ulds_list, packages_list):
     return fitness_score
 
 
-def is_stable(package, uld):
-    """Checks if a package is stably placed within a ULD."""
-    for other_package in uld.packages:
-        if package.position and other_package.position:
-            if (package.position[2] > other_package.position[2] and 
-                package.weight > other_package.weight):
-                return False
+def count_unstable(z0, w):
+    """Counts the packages that rest higher than a lighter package.
+
+    z0 and w hold the base heights and weights of the packages of one ULD.
+    After sorting by z0, each package is compared against the running minimum
+    weight of all packages strictly below it, so the check is O(N log N).
+    """
+    idx = np.argsort(z0, kind='stable')
+    zs, ws = z0[idx], w[idx]
+
+    lightest = np.minimum.accumulate(ws)
+    # Packages strictly below one end where its own z0 level starts
+    below = np.searchsorted(zs, zs, side='left')
+    lightest_below = np.where(below > 0, lightest[below - 1], np.inf)
+    return int(np.count_nonzero(ws > lightest_below))
+
+
+def package_arrays(packages_list):
+    """Returns the package fields as arrays (length, width, height, weight, priority)."""
+    pkg_l = np.array([pkg.length for pkg in packages_list])
+    pkg_w = np.array([pkg.width for pkg in packages_list])
+    pkg_h = np.array([pkg.height for pkg in packages_list])
+    pkg_wt = np.array([pkg.weight for pkg in packages_list])
+    pkg_prio = np.array([pkg.priority for pkg in packages_list], dtype=bool)
+    return pkg_l, pkg_w, pkg_h, pkg_wt, pkg_prio
+
+
+@njit(cache=True)
+def _window_free(occ, gx, gy, gz, wl, ww, wh):
+    """Checks that no cell of the occupancy window is used."""
+    for i in range(gx, gx + wl):
+        for j in range(gy, gy + ww):
+            for k in range(gz, gz + wh):
+                if occ[i, j, k]:
+                    return False
     return True
 
 
+@njit(cache=True)
+def _place_member(order, pkg_dims, pkg_wts, uld_dims, uld_limits, positions, ulds):
+    """Compiled counterpart of filling every ULD with ULD.add_package.
+
+    Packages are offered in the given order, first to ULD 0 and then to the
+    next ULDs, using the same extreme point search and occupancy grid
+    fallback as the ULD methods. positions (N, 6) and ulds (N,) receive the
+    box and ULD index of every package placed; other rows are left as is.
+    """
+    n = order.shape[0]
+    c = OCCUPANCY_CELL
+    placed = np.zeros(n, dtype=np.bool_)
+    boxes_lo = np.empty(n, dtype=np.uint64)
+    boxes_hi = np.empty(n, dtype=np.uint64)
+    points = np.empty((3 * n + 1, 3), dtype=np.int64)
+    min_wt = pkg_wts.min() if n > 0 else 0.0
+
+    for u in range(uld_dims.shape[0]):
+        length, width, height = uld_dims[u, 0], uld_dims[u, 1], uld_dims[u, 2]
+        occ = np.zeros((-(-length // c), -(-width // c), -(-height // c)), dtype=np.uint8)
+        n_boxes = 0
+        points[0, 0], points[0, 1], points[0, 2] = 0, 0, 0
+        n_points = 1
+        total_weight = 0.0
+
+        for k in range(n):
+            i = order[k]
+            l, w, h = pkg_dims[i, 0], pkg_dims[i, 1], pkg_dims[i, 2]
+            if placed[i] or l > length or w > width or h > height:
+                continue
+            if total_weight + pkg_wts[i] > uld_limits[u]:
+                continue
+
+            # Extreme points in bottom-left-back order (z, then y, then x)
+            keys = ((points[:n_points, 2] * (width + 1) + points[:n_points, 1]) * (length + 1)
+                    + points[:n_points, 0])
+            found = False
+            for j in np.argsort(keys):
+                x, y, z = points[j, 0], points[j, 1], points[j, 2]
+                if x + l > length or y + w > width or z + h > height:
+                    continue
+                if not _overlap_any(pack_corner(x, y, z), pack_corner(x + l, y + w, z + h),
+                                    boxes_lo[:n_boxes], boxes_hi[:n_boxes]):
+                    found = True
+                    break
+
+            if not found:
+                # Occupancy grid fallback, same order as ULD.find_free_cell
+                wl, ww, wh = -(-l // c), -(-w // c), -(-h // c)
+                for gz in range((height - h) // c + 1):
+                    for gy in range((width - w) // c + 1):
+                        for gx in range((length - l) // c + 1):
+                            if _window_free(occ, gx, gy, gz, wl, ww, wh):
+                                x, y, z = gx * c, gy * c, gz * c
+                                found = True
+                                break
+                        if found:
+                            break
+                    if found:
+                        break
+                if not found:
+                    continue
+
+            boxes_lo[n_boxes] = pack_corner(x, y, z)
+            boxes_hi[n_boxes] = pack_corner(x + l, y + w, z + h)
+            positions[i, 0], positions[i, 1], positions[i, 2] = x, y, z
+            positions[i, 3], positions[i, 4], positions[i, 5] = x + l, y + w, z + h
+            ulds[i] = u
+            n_boxes += 1
+            placed[i] = True
+            total_weight += pkg_wts[i]
+            occ[x // c:-(-(x + l) // c), y // c:-(-(y + w) // c), z // c:-(-(z + h) // c)] = 1
+
+            # Replace the used corner with the three corners exposed by the box
+            for j in range(n_points):
+                if points[j, 0] == x and points[j, 1] == y and points[j, 2] == z:
+                    n_points -= 1
+                    points[j, :] = points[n_points]
+                    break
+            for corner in range(3):
+                px = x + l if corner == 0 else x
+                py = y + w if corner == 1 else y
+                pz = z + h if corner == 2 else z
+                if px >= length or py >= width or pz >= height:
+                    continue
+                duplicate = False
+                for j in range(n_points):
+                    if points[j, 0] == px and points[j, 1] == py and points[j, 2] == pz:
+                        duplicate = True
+                        break
+                if not duplicate:
+                    points[n_points, 0], points[n_points, 1], points[n_points, 2] = px, py, pz
+                    n_points += 1
+
+            if total_weight > uld_limits[u] - min_wt:
+                break  # Not even the lightest package fits the remaining weight
+
+
+@njit(cache=True, parallel=True)
+def build_population(pkg_dims, pkg_wts, uld_dims, uld_limits, orders, out_positions, out_ulds):
+    """Places every population member in parallel, one package order per row of orders."""
+    for member in prange(orders.shape[0]):
+        _place_member(orders[member], pkg_dims, pkg_wts, uld_dims, uld_limits,
+                      out_positions[member], out_ulds[member])
+
+
+class Solution:
+    """A member of the population: its placement plan and fitness score."""
+    __slots__ = ('plan', 'fitness')
+
+    def __init__(self, plan, fitness):
+        self.plan = plan  # List of (package index, ULD index, x0, y0, z0)
+        self.fitness = fitness
+
+
+def decreasing_volume_orders(volumes, population_size):
+    """Draws one package order per solution, largest packages first.
+
+    The first order is plain First-Fit-Decreasing. The others sort on the
+    log2 of each volume plus a random offset of up to ORDER_SPREAD, so
+    packages within a factor of 2 ** ORDER_SPREAD in volume can swap places.
+    Every order stays close to First-Fit-Decreasing, but the solutions still
+    differ when no two packages share a power-of-two volume bucket.
+    """
+    log_volumes = np.log2(np.maximum(volumes, 1))
+    orders = np.empty((population_size, len(volumes)), dtype=np.int64)
+    for member in range(population_size):
+        jitter = np.random.random(len(volumes)) * ORDER_SPREAD if member else 0
+        orders[member] = np.argsort(-(log_volumes + jitter), kind='stable')
+    return orders
+
+
+def _create_population_compiled(ulds_list, packages_list, pkg_l, pkg_w, pkg_h, pkg_wt, pkg_prio,
+                                orders):
+    """Places every solution with compiled code and turns the result into scored solutions.
+
+    The parallel Numba kernel is used when available, otherwise the
+    placement_core extension places the solutions one after the other.
+    """
+    pkg_dims = np.column_stack((pkg_l, pkg_w, pkg_h)).astype(np.int64)
+    pkg_wts = pkg_wt.astype(np.float64)
+    uld_dims = np.array([(uld.length, uld.width, uld.height) for uld in ulds_list],
+                        dtype=np.int64).reshape(-1, 3)  # Keeps two axes with no ULDs
+    uld_limits = np.array([uld.weight_limit for uld in ulds_list], dtype=np.float64)
+
+    out_positions = np.full(orders.shape + (6,), -1, dtype=np.int32)
+    out_ulds = np.full(orders.shape, -1, dtype=np.int32)
+    if NUMBA_AVAILABLE:
+        build_population(pkg_dims, pkg_wts, uld_dims, uld_limits, orders, out_positions, out_ulds)
+    else:
+        pkg_dims, uld_dims = pkg_dims.astype(np.int32), uld_dims.astype(np.int32)
+        for member, order in enumerate(orders.astype(np.int32)):
+            placements = place_all(pkg_dims, pkg_wts, uld_dims, uld_limits, order, OCCUPANCY_CELL)
+            out_ulds[member] = placements[:, 0]
+            out_positions[member] = placements[:, 1:]
+
+    population = []
+    for positions, ulds in zip(out_positions, out_ulds):
+        plan = []
+        uld_states = []
+        for uld_index, uld in enumerate(ulds_list):
+            in_uld = np.flatnonzero(ulds == uld_index)
+            plan.extend((int(i), uld_index) + tuple(positions[i, :3].tolist()) for i in in_uld)
+            uld_packages = [packages_list[i] for i in in_uld]
+            uld_states.append((uld.weight_limit, sum(pkg.weight for pkg in uld_packages),
+                               bool(pkg_prio[in_uld].any()),
+                               # Same stack as apply_plan leaves in uld.stack
+                               tuple(zip(positions[in_uld, 2].tolist(),
+                                         (pkg.weight for pkg in uld_packages)))))
+        unplaced_economy_packages = int(np.count_nonzero((ulds < 0) & ~pkg_prio))
+        population.append(Solution(plan, score_solution(tuple(uld_states),
+                                                        unplaced_economy_packages)))
+    return population
+
+
 def create_initial_population(ulds_list, packages_list, population_size):
-    """Creates the initial population for the genetic algorithm."""
+    """Creates the initial population for the genetic algorithm.
+
+    Each Solution holds a plan, a list of (package index, ULD index, x0, y0, z0)
+    placements, scored once here. Use apply_plan to load a plan into the ULDs
+    and packages.
+
+    With Numba installed, all solutions are built in parallel by the compiled
+    build_population kernel, else by the placement_core extension if it is
+    built. Otherwise the ULDs are filled one solution at a time through
+    ULD.add_package, and are left holding the last one.
+    """
+    pkg_l, pkg_w, pkg_h, pkg_wt, pkg_prio = package_arrays(packages_list)
+    orders = decreasing_volume_orders(pkg_l * pkg_w * pkg_h, population_size)
+    if NUMBA_AVAILABLE or PLACEMENT_CORE_AVAILABLE:
+        return _create_population_compiled(ulds_list, packages_list,
+                                           pkg_l, pkg_w, pkg_h, pkg_wt, pkg_prio, orders)
+
     population = []
+
+    # Packages larger than a ULD can never go in it, whatever the order.
+    for uld in ulds_list:
+        uld.eligible_mask = (pkg_l <= uld.length) & (pkg_w <= uld.width) & (pkg_h <= uld.height)
+    min_wt = pkg_wt.min() if len(pkg_wt) else 0
     
-    for _ in range(population_size):
-        random.shuffle(packages_list)
-        solution = []
+    for order in orders:
+        plan = []
+        placed_mask = np.zeros(len(packages_list), dtype=bool)
+        for package in packages_list:
+            package.reset()
         
-        for uld in ulds_list:
-            for package in packages_list:
-                uld.add_package(package)  # Weight constraint is now respected.
-                
-            solution.append(uld)
+        for uld_index, uld in enumerate(ulds_list):
+            uld.reset()
+            total_weight = 0
+            for i in order[uld.eligible_mask[order]]:
+                package = packages_list[i]
+                if package.placed:
+                    continue  # Already in an earlier ULD of this solution
+                if total_weight + pkg_wt[i] > uld.weight_limit:
+                    continue
+                if uld.add_package(package):
+                    total_weight += pkg_wt[i]
+                    placed_mask[i] = True
+                    plan.append((int(i), uld_index) + package.position[:3])
+                    if total_weight > uld.weight_limit - min_wt:
+                        break  # Not even the lightest package fits the remaining weight
         
-        population.append(solution)
+        fitness = fitness_function(ulds_list, packages_list, placed_mask, pkg_prio)
+        population.append(Solution(plan, fitness))
     
     return population
 
 
-def generate_output(ulds_list, packages_list):
-    """Generates the final output in the required format."""
-    total_cost = -fitness_function(ulds_list, packages_list)
-    total_packed = sum(1 for pkg in packages_list if pkg.placed)
-    num_priority_uld = sum(1 for uld in ulds_list if any(pkg.priority for pkg in uld.packages))
+def apply_plan(plan, ulds_list, packages_list):
+    """Loads a plan from create_initial_population into the ULDs and packages.
 
-    output_lines = [f"{total_cost},{total_packed},{num_priority_uld}"]
-    
-    for pkg in packages_list:
-        if pkg.placed:
-            x0, y0, z0, x1, y1, z1 = pkg.position
-            output_lines.append(f"{pkg.id},{pkg.uld_id},{x0},{y0},{z0},{x1},{y1},{z1}")
-        else:
-            output_lines.append(f"{pkg.id},NONE,-1,-1,-1,-1,-1,-1")
+    Returns the placed_mask of the loaded plan, see generate_output.
+    """
+    for uld in ulds_list:
+        uld.reset()
+    for package in packages_list:
+        package.reset()
+
+    placed_mask = np.zeros(len(packages_list), dtype=bool)
+    for pkg_index, uld_index, x0, y0, z0 in plan:
+        ulds_list[uld_index].place_package(packages_list[pkg_index], (x0, y0, z0))
+        placed_mask[pkg_index] = True
+    return placed_mask
+
+
+def select_best_plan(population):
+    """Returns the plan of the population with the highest fitness score."""
+    return max(population, key=lambda solution: solution.fitness).plan
+
+
+def generate_output(ulds_list, packages_list, placed_mask=None, priority_mask=None):
+    """Generates the final output in the required format.
+
+    placed_mask and priority_mask are the same as for fitness_function, the
+    placed_mask returned by apply_plan can be passed as is. Both the header
+    and the rows are built from placed_mask.
+    """
+    if placed_mask is None or priority_mask is None:
+        placed_mask, priority_mask = placement_masks(packages_list)
+    total_cost = -fitness_function(ulds_list, packages_list, placed_mask, priority_mask)
+    total_packed = int(np.count_nonzero(placed_mask))
+    num_priority_uld = sum(1 for uld in ulds_list if uld.priority_count)
+
+    header = "%s,%d,%d" % (total_cost, total_packed, num_priority_uld)
+    placed_line = "%s,%s,%d,%d,%d,%d,%d,%d"
+    unplaced_line = "%s,NONE,-1,-1,-1,-1,-1,-1"
+
+    output_lines = [header]
+    output_lines.extend(placed_line % ((pkg.id, pkg.uld_id) + pkg.position) if placed
+                        else unplaced_line % (pkg.id,)
+                        for pkg, placed in zip(packages_list, placed_mask.tolist()))
     
     return "\n".join(output_lines)
 
@@ -184,9 +659,13 @@ if __name__ == "__main__":
         Package("P-3", 100, 100, 50, 50, False, 200),
         Package("P-4", 30, 30, 30, 10, True, None)
     ]
+    priority_mask_new_name = np.array([pkg.priority for pkg in packages_data_new_name], dtype=bool)
     
-    best_solution_new_name = create_initial_population(ulds_data_new_name.copy(), packages_data_new_name.copy(), population_size=10)
+    population_new_name = create_initial_population(ulds_data_new_name, packages_data_new_name, population_size=10)
+    best_solution_new_name = select_best_plan(population_new_name)
+    placed_mask_new_name = apply_plan(best_solution_new_name, ulds_data_new_name, packages_data_new_name)
     
-    output_result_new_name = generate_output(ulds_data_new_name.copy(), packages_data_new_name.copy())
+    output_result_new_name = generate_output(ulds_data_new_name.copy(), packages_data_new_name.copy(),
+                                             placed_mask_new_name, priority_mask_new_name)
     
     print(output_result_new_name)
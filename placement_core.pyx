@@ -0,0 +1,157 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""Compiled package placement, used by main.py when Numba is not installed.
+
+Build it next to main.py with ``python setup.py build_ext --inplace``.
+"""
+import numpy as np
+
+
+cdef inline int ceil_div(int a, int b) nogil:
+    return (a + b - 1) // b
+
+
+cdef inline long long point_key(int x, int y, int z, int length, int width) nogil:
+    """Sort key of an extreme point: bottom-left-back order (z, then y, then x)."""
+    return (<long long>z * (width + 1) + y) * (length + 1) + x
+
+
+cdef bint window_free(unsigned char[:, :, ::1] occ, int gx, int gy, int gz,
+                      int wl, int ww, int wh) nogil:
+    """Checks that no cell of the occupancy window is used."""
+    cdef int i, j, k
+    for i in range(gx, gx + wl):
+        for j in range(gy, gy + ww):
+            for k in range(gz, gz + wh):
+                if occ[i, j, k]:
+                    return False
+    return True
+
+
+cdef bint overlaps_any(int[:, ::1] boxes, int n_boxes, int x0, int y0, int z0,
+                       int x1, int y1, int z1) nogil:
+    """Checks if the box overlaps any of the first n_boxes placed boxes."""
+    cdef int b
+    for b in range(n_boxes):
+        if not (boxes[b, 3] <= x0 or boxes[b, 0] >= x1 or
+                boxes[b, 4] <= y0 or boxes[b, 1] >= y1 or
+                boxes[b, 5] <= z0 or boxes[b, 2] >= z1):
+            return True
+    return False
+
+
+def place_all(const int[:, ::1] pkg_dims, const double[::1] pkg_wts,
+              const int[:, ::1] uld_dims, const double[::1] uld_limits,
+              const int[::1] order, int cell):
+    """Greedily places the packages in the given order, like main._place_member.
+
+    Returns an (N, 7) int32 array with the ULD index and the box
+    (x0, y0, z0, x1, y1, z1) of every package, or -1 in every column for the
+    packages that were not placed.
+    """
+    cdef Py_ssize_t n = order.shape[0]
+    result = np.full((n, 7), -1, dtype=np.int32)
+    cdef int[:, ::1] out = result
+    cdef unsigned char[::1] placed = np.zeros(n, dtype=np.uint8)
+    cdef int[:, ::1] boxes = np.empty((n, 6), dtype=np.int32)
+    # Extreme points, kept sorted by point_key
+    cdef int[:, ::1] points = np.empty((3 * n + 1, 3), dtype=np.int32)
+    cdef unsigned char[:, :, ::1] occ
+
+    cdef Py_ssize_t u, k, j, m
+    cdef int i, length, width, height, l, w, h, x, y, z, px, py, pz, corner
+    cdef int wl, ww, wh, gx, gy, gz, n_boxes, n_points
+    cdef long long key
+    cdef double total_weight
+    cdef double min_wt = np.min(pkg_wts) if n > 0 else 0.0
+    cdef bint found
+
+    for u in range(uld_dims.shape[0]):
+        length, width, height = uld_dims[u, 0], uld_dims[u, 1], uld_dims[u, 2]
+        occ = np.zeros((ceil_div(length, cell), ceil_div(width, cell), ceil_div(height, cell)),
+                       dtype=np.uint8)
+        n_boxes = 0
+        points[0, 0] = 0
+        points[0, 1] = 0
+        points[0, 2] = 0
+        n_points = 1
+        total_weight = 0.0
+
+        for k in range(n):
+            i = order[k]
+            l, w, h = pkg_dims[i, 0], pkg_dims[i, 1], pkg_dims[i, 2]
+            if placed[i] or l > length or w > width or h > height:
+                continue
+            if total_weight + pkg_wts[i] > uld_limits[u]:
+                continue
+
+            found = False
+            for j in range(n_points):
+                x, y, z = points[j, 0], points[j, 1], points[j, 2]
+                if x + l > length or y + w > width or z + h > height:
+                    continue
+                if not overlaps_any(boxes, n_boxes, x, y, z, x + l, y + w, z + h):
+                    found = True
+                    break
+
+            if not found:
+                # Occupancy grid fallback, same order as ULD.find_free_cell
+                wl, ww, wh = ceil_div(l, cell), ceil_div(w, cell), ceil_div(h, cell)
+                gz = 0
+                while not found and gz <= (height - h) // cell:
+                    gy = 0
+                    while not found and gy <= (width - w) // cell:
+                        gx = 0
+                        while not found and gx <= (length - l) // cell:
+                            if window_free(occ, gx, gy, gz, wl, ww, wh):
+                                x, y, z = gx * cell, gy * cell, gz * cell
+                                found = True
+                            gx += 1
+                        gy += 1
+                    gz += 1
+                if not found:
+                    continue
+
+            boxes[n_boxes, 0], boxes[n_boxes, 1], boxes[n_boxes, 2] = x, y, z
+            boxes[n_boxes, 3], boxes[n_boxes, 4], boxes[n_boxes, 5] = x + l, y + w, z + h
+            n_boxes += 1
+            out[i, 0] = u
+            out[i, 1], out[i, 2], out[i, 3] = x, y, z
+            out[i, 4], out[i, 5], out[i, 6] = x + l, y + w, z + h
+            placed[i] = True
+            total_weight += pkg_wts[i]
+            occ[x // cell:ceil_div(x + l, cell),
+                y // cell:ceil_div(y + w, cell),
+                z // cell:ceil_div(z + h, cell)] = 1
+
+            # Replace the used corner with the three corners exposed by the box
+            for j in range(n_points):
+                if points[j, 0] == x and points[j, 1] == y and points[j, 2] == z:
+                    for m in range(j, n_points - 1):
+                        points[m, 0], points[m, 1], points[m, 2] = \
+                            points[m + 1, 0], points[m + 1, 1], points[m + 1, 2]
+                    n_points -= 1
+                    break
+            for corner in range(3):
+                px = x + l if corner == 0 else x
+                py = y + w if corner == 1 else y
+                pz = z + h if corner == 2 else z
+                if px >= length or py >= width or pz >= height:
+                    continue
+                key = point_key(px, py, pz, length, width)
+                j = 0
+                while j < n_points and point_key(points[j, 0], points[j, 1], points[j, 2],
+                                                 length, width) < key:
+                    j += 1
+                if j < n_points and point_key(points[j, 0], points[j, 1], points[j, 2],
+                                              length, width) == key:
+                    continue  # Already a candidate
+                for m in range(n_points, j, -1):
+                    points[m, 0], points[m, 1], points[m, 2] = \
+                        points[m - 1, 0], points[m - 1, 1], points[m - 1, 2]
+                points[j, 0], points[j, 1], points[j, 2] = px, py, pz
+                n_points += 1
+
+            if total_weight > uld_limits[u] - min_wt:
+                break  # Not even the lightest package fits the remaining weight
+
+    return result
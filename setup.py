@@ -0,0 +1,11 @@
+"""Builds the optional placement_core extension: python setup.py build_ext --inplace"""
+from Cython.Build import cythonize
+from setuptools import Extension, setup
+
+setup(
+    name="tech_meet-placement-core",  # Distribution of the extension only, not of main.py
+    ext_modules=cythonize([
+        Extension("placement_core", ["placement_core.pyx"],
+                  extra_compile_args=["-O3", "-march=native"]),
+    ]),
+)
@@ -0,0 +1,174 @@
+"""Checks that the Numba, Cython and pure Python placement paths agree.
+
+Run with python -m unittest. The compiled paths are skipped when Numba or
+the placement_core extension (python setup.py build_ext --inplace) is missing.
+"""
+import random
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import main
+
+BACKENDS = {
+    'numba': (True, False),
+    'placement_core': (False, True),
+    'python': (False, False),
+}
+AVAILABLE = {
+    'numba': main.NUMBA_AVAILABLE,
+    'placement_core': main.PLACEMENT_CORE_AVAILABLE,
+    'python': True,
+}
+
+
+def random_instance(seed, n_ulds=3, n_packages=70):
+    """Returns ULDs and packages drawn from a fixed seed."""
+    rng = random.Random(seed)
+    ulds = [main.ULD(f"U{k}", rng.randint(100, 250), rng.randint(100, 320),
+                     rng.randint(100, 250), rng.randint(300, 3000)) for k in range(n_ulds)]
+    packages = [main.Package(f"P-{i}", rng.randint(10, 90), rng.randint(10, 90),
+                             rng.randint(10, 90), rng.randint(5, 60), rng.random() < 0.3, 10)
+                for i in range(n_packages)]
+    return ulds, packages
+
+
+def build_population(backend, ulds, packages, seed, population_size=4):
+    """Builds a population with only the given placement path enabled."""
+    numba, core = BACKENDS[backend]
+    with mock.patch.multiple(main, NUMBA_AVAILABLE=numba, PLACEMENT_CORE_AVAILABLE=core):
+        np.random.seed(seed)
+        return main.create_initial_population(ulds, packages, population_size)
+
+
+class PlacementBackendTest(unittest.TestCase):
+
+    def assert_feasible(self, ulds, packages):
+        """Checks the loaded ULDs for overlaps, out of bounds boxes and overweight."""
+        for uld in ulds:
+            self.assertLessEqual(sum(pkg.weight for pkg in uld.packages), uld.weight_limit)
+            for i, pkg in enumerate(uld.packages):
+                x0, y0, z0, x1, y1, z1 = pkg.position
+                self.assertTrue(0 <= x0 and 0 <= y0 and 0 <= z0)
+                self.assertTrue(x1 <= uld.length and y1 <= uld.width and z1 <= uld.height)
+                for other in uld.packages[:i]:
+                    self.assertFalse(uld.do_packages_overlap(pkg.position, other.position))
+
+    def test_backends_agree(self):
+        backends = [name for name in BACKENDS if AVAILABLE[name]]
+        for seed in range(4):
+            ulds, packages = random_instance(seed)
+            priority_mask = np.array([pkg.priority for pkg in packages], dtype=bool)
+            results = {}
+            for backend in backends:
+                population = build_population(backend, ulds, packages, seed)
+                results[backend] = [(sorted(s.plan), s.fitness) for s in population]
+
+                for solution in population:
+                    placed_mask = main.apply_plan(solution.plan, ulds, packages)
+                    self.assert_feasible(ulds, packages)
+                    np.testing.assert_array_equal(placed_mask,
+                                                  main.placement_masks(packages)[0])
+                    self.assertEqual(solution.fitness, main.fitness_function(ulds, packages))
+
+                    output = main.generate_output(ulds, packages, placed_mask, priority_mask)
+                    header, *rows = output.split("\n")
+                    placed_rows = sum(",NONE," not in row for row in rows)
+                    self.assertEqual(int(header.split(",")[1]), placed_rows)
+                    self.assertEqual(placed_rows, np.count_nonzero(placed_mask))
+
+            for backend in backends:
+                with self.subTest(seed=seed, backend=backend):
+                    self.assertEqual(results[backend], results['python'])
+
+    def test_no_ulds(self):
+        _, packages = random_instance(0, n_packages=5)
+        expected = -50 * sum(not pkg.priority for pkg in packages)
+        for backend in BACKENDS:
+            if not AVAILABLE[backend]:
+                continue
+            with self.subTest(backend=backend):
+                population = build_population(backend, [], packages, 0, population_size=2)
+                self.assertEqual([(s.plan, s.fitness) for s in population],
+                                 [([], expected)] * 2)
+
+    def test_distinct_volumes_give_distinct_plans(self):
+        # No two of these packages share a power-of-two volume bucket
+        ulds = [main.ULD("U1", 224, 318, 162, 100), main.ULD("U2", 244, 318, 244, 70)]
+        packages = [main.Package("P-1", 50, 50, 50, 20, False, 100),
+                    main.Package("P-2", 70, 60, 60, 30, True, None),
+                    main.Package("P-3", 100, 100, 50, 50, False, 200),
+                    main.Package("P-4", 30, 30, 30, 10, True, None)]
+        for backend in BACKENDS:
+            if not AVAILABLE[backend]:
+                continue
+            with self.subTest(backend=backend):
+                population = build_population(backend, ulds, packages, 0, population_size=10)
+                self.assertGreater(len({tuple(sorted(s.plan)) for s in population}), 1)
+
+
+class OverlapTest(unittest.TestCase):
+    """The packed (SWAR) overlap tests against the plain do_packages_overlap."""
+
+    def random_box(self, rng, limit=40):
+        x, y, z = (rng.randint(0, limit) for _ in range(3))
+        return (x, y, z, x + rng.randint(1, 20), y + rng.randint(1, 20), z + rng.randint(1, 20))
+
+    def test_packed_overlap_matches_do_packages_overlap(self):
+        rng = random.Random(0)
+        for trial in range(300):
+            uld = main.ULD("U1", 60, 60, 60, 10 ** 6)
+            placed = [self.random_box(rng) for _ in range(rng.randint(0, 10))]
+            for k, box in enumerate(placed):
+                # place_package does no checks, so the placed boxes may overlap each other
+                package = main.Package(f"B-{k}", box[3] - box[0], box[4] - box[1],
+                                       box[5] - box[2], 1, False, 0)
+                uld.place_package(package, box[:3])
+
+            candidate = self.random_box(rng, limit=50)  # Some end outside the ULD
+            x0, y0, z0, x1, y1, z1 = candidate
+            expected = any(uld.do_packages_overlap(candidate, box) for box in placed)
+            inside = x1 <= uld.length and y1 <= uld.width and z1 <= uld.height
+            package = main.Package("C", x1 - x0, y1 - y0, z1 - z0, 1, False, 0)
+            with self.subTest(trial=trial):
+                self.assertEqual(main._overlap_any(main.pack_corner(x0, y0, z0),
+                                                   main.pack_corner(x1, y1, z1),
+                                                   uld._box_lo, uld._box_hi), expected)
+                self.assertEqual(uld.is_position_valid(package, x0, y0, z0),
+                                 inside and not expected)
+
+
+class StabilityTest(unittest.TestCase):
+
+    def test_count_unstable_matches_pairwise_rule(self):
+        # The pairwise rule count_unstable replaced: a package is unstable if it
+        # rests higher than a lighter package
+        rng = np.random.default_rng(0)
+        for trial in range(300):
+            n = int(rng.integers(0, 12))
+            z0 = rng.integers(0, 5, n).astype(float)
+            w = rng.integers(1, 6, n).astype(float)
+            expected = sum(any(z0[i] > z0[j] and w[i] > w[j] for j in range(n))
+                           for i in range(n))
+            with self.subTest(trial=trial):
+                self.assertEqual(main.count_unstable(z0, w), expected)
+
+
+class DimensionTest(unittest.TestCase):
+
+    def test_integral_floats_are_converted(self):
+        package = main.Package("P-1", 50.0, 40, np.int64(30), 10, False, 0)
+        uld = main.ULD("U1", 100.0, 100, 100.0, 50)
+        self.assertEqual((package.length, package.width, package.height), (50, 40, 30))
+        self.assertTrue(all(type(d) is int for d in (uld.length, uld.width, uld.height)))
+
+    def test_fractional_dimensions_are_rejected(self):
+        with self.assertRaisesRegex(ValueError, "fractional"):
+            main.Package("P-1", 50.5, 40, 30, 10, False, 0)
+        with self.assertRaisesRegex(ValueError, "fractional"):
+            main.ULD("U1", 100, 99.9, 100, 50)
+
+
+if __name__ == '__main__':
+    unittest.main()